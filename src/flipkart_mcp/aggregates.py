@@ -0,0 +1,212 @@
+"""
+Product digest computation for the Flipkart MCP Server.
+
+A digest is a compact summary of a product payload (effective price after bank
+offers, offer type counts, rating and highlights). Digests are split into
+sections keyed by a fingerprint of the payload fields they are built from, so a
+refreshed product only recomputes the sections whose inputs changed.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Bank offer description patterns, e.g.
+# "10% off on ICICI Bank Credit Card, up to ₹1000 on orders of ₹5,000 and above"
+# "Flat ₹1,250 Off on HDFC Bank Credit Card EMI Txns, Min. Txn Value: ₹15,000"
+# "Upto ₹3,000 off on ICICI Bank Credit Card" (a cap, not a guaranteed discount)
+# "5% Unlimited Cashback on Flipkart Axis Bank Credit Card"
+# "10% off on Kotak Bank Credit Card Txns above ₹500"
+# An optional qualifier word may sit before the keyword ("Instant Discount",
+# "Unlimited Cashback", "extra off").
+_PERCENT_OFF = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*(?:[a-z]+\s+)?(?:off|discount|cashback)\b", re.IGNORECASE)
+_FLAT_OFF = re.compile(r"(up\s*to\s*)?₹\s*([\d,]+)\s*(?:[a-z]+\s+)?(?:off|discount|cashback)\b", re.IGNORECASE)
+_UP_TO = re.compile(r"up\s*to\s*₹\s*([\d,]+)", re.IGNORECASE)
+_MIN_ORDER = re.compile(
+    r"(?:(?:orders?|txns?|transactions?)\s*(?:value\s*)?(?:of|above)|min(?:imum)?\.?\s*(?:txn|transaction|order)\s*value\s*:?)\s*₹\s*([\d,]+)",
+    re.IGNORECASE,
+)
+
+RATING_BUCKETS = ["4.5+", "4.0-4.5", "3.0-4.0", "below 3.0", "unrated"]
+TOP_HIGHLIGHTS = 3
+
+
+def _amount(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _price(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_bank_offer(description: str) -> Optional[Dict[str, Optional[float]]]:
+    """
+    Parse the discount terms of a bank offer description.
+
+    Returns:
+        Dict with "percent", "flat", "max_discount" and "min_order" (any may be None),
+        or None if the description carries no recognisable discount
+    """
+    percent = _PERCENT_OFF.search(description)
+    # "up to ₹X off" only caps the discount, so it is not a flat amount
+    flat = next((match for match in _FLAT_OFF.finditer(description) if not match.group(1)), None)
+    up_to = _UP_TO.search(description)
+    if not percent and not flat and not up_to:
+        return None
+
+    min_order = _MIN_ORDER.search(description)
+    return {
+        "percent": float(percent.group(1)) if percent else None,
+        "flat": _amount(flat.group(2)) if flat and not percent else None,
+        "max_discount": _amount(up_to.group(1)) if up_to else None,
+        "min_order": _amount(min_order.group(1)) if min_order else None,
+    }
+
+
+def bank_offer_discount(terms: Dict[str, Optional[float]], price: float) -> float:
+    """Discount a parsed bank offer gives on a given price (0 if not applicable)."""
+    if terms["min_order"] is not None and price < terms["min_order"]:
+        return 0.0
+
+    if terms["percent"] is not None:
+        discount = price * terms["percent"] / 100
+        if terms["max_discount"] is not None:
+            discount = min(discount, terms["max_discount"])
+    else:
+        discount = terms["flat"] or 0.0
+        if terms["max_discount"] is not None:
+            discount = min(discount, terms["max_discount"])
+    return round(min(discount, price), 2)
+
+
+def rating_bucket(rating: Any) -> str:
+    """Map a product rating to one of RATING_BUCKETS."""
+    value = _price(rating)
+    if value is None or value <= 0:
+        return "unrated"
+    if value >= 4.5:
+        return "4.5+"
+    if value >= 4.0:
+        return "4.0-4.5"
+    if value >= 3.0:
+        return "3.0-4.0"
+    return "below 3.0"
+
+
+def _pricing_section(product: Dict[str, Any]) -> Dict[str, Any]:
+    current_price = _price(product.get("current_price"))
+    offers: List[Dict[str, Any]] = product.get("offers") or []
+
+    offer_type_counts: Dict[str, int] = {}
+    best_offer: Optional[Dict[str, Any]] = None
+    for offer in offers:
+        offer_type = offer.get("offer_type") or "Other"
+        offer_type_counts[offer_type] = offer_type_counts.get(offer_type, 0) + 1
+
+        # Bank offers don't stack, so only the single best applicable one counts.
+        # Other offer types (e.g. "Special Price") are already in current_price.
+        if offer_type != "Bank Offer" or current_price is None:
+            continue
+        description = offer.get("description") or ""
+        terms = parse_bank_offer(description)
+        if terms is None:
+            continue
+        discount = bank_offer_discount(terms, current_price)
+        if discount > 0 and (best_offer is None or discount > best_offer["discount"]):
+            best_offer = {"description": description, "discount": discount}
+
+    best_effective_price = current_price
+    if current_price is not None and best_offer is not None:
+        best_effective_price = round(current_price - best_offer["discount"], 2)
+
+    return {
+        "current_price": product.get("current_price"),
+        "original_price": product.get("original_price"),
+        "discount_percent": product.get("discount_percent", product.get("calculated_discount_percent")),
+        "best_effective_price": best_effective_price,
+        "best_bank_offer": best_offer,
+        "offer_count": len(offers),
+        "offer_type_counts": offer_type_counts,
+    }
+
+
+def _rating_section(product: Dict[str, Any]) -> Dict[str, Any]:
+    seller = product.get("seller") or {}
+    return {
+        "rating": product.get("rating"),
+        "rating_bucket": rating_bucket(product.get("rating")),
+        "seller_name": seller.get("seller_name"),
+        "seller_rating": seller.get("seller_rating"),
+    }
+
+
+def _highlights_section(product: Dict[str, Any]) -> List[str]:
+    highlights: List[str] = product.get("highlights") or []
+    return highlights[:TOP_HIGHLIGHTS]
+
+
+# Section name -> (payload fields it depends on, builder)
+_SECTIONS: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]] = {
+    "pricing": (
+        ("current_price", "original_price", "discount_percent", "calculated_discount_percent", "offers"),
+        _pricing_section,
+    ),
+    "rating": (("rating", "seller"), _rating_section),
+    "top_highlights": (("highlights",), _highlights_section),
+}
+
+
+def _fingerprint(product: Dict[str, Any], fields: Tuple[str, ...]) -> str:
+    payload = json.dumps([product.get(field) for field in fields], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def update_digest(product: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the digest for a product payload.
+
+    Args:
+        product: Product payload as returned by get_product_details
+        previous: Digest computed for an earlier version of the same product, if any.
+                  Sections whose input fields are unchanged are reused from it.
+
+    Returns:
+        Dict containing the digest, with section fingerprints under "_fingerprints"
+    """
+    previous_fingerprints: Dict[str, str] = (previous or {}).get("_fingerprints", {})
+
+    digest: Dict[str, Any] = {
+        "name": product.get("name"),
+        "product_id": product.get("product_id"),
+        "flipkart_url": product.get("flipkart_url"),
+        "in_stock": product.get("in_stock"),
+        "f_assured": product.get("f_assured"),
+    }
+    fingerprints: Dict[str, str] = {}
+    for section, (fields, builder) in _SECTIONS.items():
+        fingerprint = _fingerprint(product, fields)
+        if previous is not None and previous_fingerprints.get(section) == fingerprint:
+            digest[section] = previous[section]
+        else:
+            digest[section] = builder(product)
+        fingerprints[section] = fingerprint
+
+    digest["_fingerprints"] = fingerprints
+    return digest
+
+
+def public_digest(digest: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip internal bookkeeping from a digest before returning it to a client."""
+    return {key: value for key, value in digest.items() if not key.startswith("_")}
+
+
+def rating_distribution(digests: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count digests per rating bucket."""
+    distribution = dict.fromkeys(RATING_BUCKETS, 0)
+    for digest in digests:
+        distribution[digest["rating"]["rating_bucket"]] += 1
+    return distribution
@@ -5,6 +5,13 @@ import os
 
 # API Configuration
 BASE_URL = os.getenv("FLIPKART_API_BASE_URL", "http://localhost:3000")
+# Comma-separated list of flipkart-scraper-api replicas (defaults to BASE_URL,
+# also when the variable is set but lists no URLs)
+BASE_URLS = [
+    url.strip().rstrip("/")
+    for url in os.getenv("FLIPKART_API_BASE_URLS", BASE_URL).split(",")
+    if url.strip()
+] or [BASE_URL.rstrip("/")]
 PORT = os.getenv("PORT", 8000)
 
 # Server Configuration
@@ -15,6 +22,38 @@ SERVER_VERSION = "0.1.0"
 DEFAULT_TIMEOUT = 30.0
 MAX_RETRIES = 3
 
+# Upstream Load Balancing Configuration
+# Balancing is "least_outstanding" (default) or "latency" (latency-weighted)
+UPSTREAM_BALANCING = os.getenv("FLIPKART_UPSTREAM_BALANCING", "least_outstanding")
+HEALTH_CHECK_INTERVAL = float(os.getenv("FLIPKART_HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_CHECK_TIMEOUT = 5.0
+# Path probed by health checks. The default "/" is a static page that only proves the
+# replica is up; a scraping path such as "/search/phone" also detects replicas that
+# Flipkart is blocking, at the cost of one real scrape per replica per interval.
+HEALTH_CHECK_PATH = os.getenv("FLIPKART_HEALTH_CHECK_PATH", "/")
+# Consecutive failures after which a replica is ejected until a health check passes
+UPSTREAM_EJECT_AFTER_FAILURES = int(os.getenv("FLIPKART_UPSTREAM_EJECT_AFTER_FAILURES", "3"))
+
+# Upstream Traffic Record/Replay Configuration
+# Mode is "live" (default), "record" (live, and append every exchange to TRAFFIC_LOG)
+# or "replay" (serve requests from TRAFFIC_LOG without touching the network)
+UPSTREAM_MODE = os.getenv("FLIPKART_UPSTREAM_MODE", "live").lower()
+TRAFFIC_LOG = os.getenv("FLIPKART_TRAFFIC_LOG", "flipkart-upstream-traffic.jsonl")
+# Replay latency divisor: 1 = original timing, 10 = ten times faster, 0 = no delay
+REPLAY_SPEED = float(os.getenv("FLIPKART_REPLAY_SPEED", "1"))
+
+# Product Cache Configuration (backs get_product_digest)
+PRODUCT_CACHE_TTL = float(os.getenv("FLIPKART_PRODUCT_CACHE_TTL", "300"))
+PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv("FLIPKART_PRODUCT_CACHE_MAX_ENTRIES", "512"))
+# Most products a single get_product_digest call fetches from upstream at once
+DIGEST_MAX_CONCURRENCY = int(os.getenv("FLIPKART_DIGEST_MAX_CONCURRENCY", "4"))
+
+# Tracing Configuration
+# Exporter is one of "none" (default, no-op), "console" (stderr), "file" or "otlp"
+TRACING_EXPORTER = os.getenv("FLIPKART_MCP_TRACING", "none").lower()
+TRACING_FILE = os.getenv("FLIPKART_MCP_TRACING_FILE", "flipkart-mcp-traces.jsonl")
+TRACING_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "flipkart-mcp-server")
+
 # Search Configuration
 SORT_OPTIONS = {
     "relevance": "relevance",
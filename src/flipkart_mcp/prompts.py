@@ -51,9 +51,10 @@ def find_best_deals(category: str) -> str:
 1. Search for products in the "{category}" category
 2. Sort results by price (low to high) to find budget options
 3. Also search with popularity sort to find highly-rated products
-4. For promising products, get detailed information to check:
+4. For promising products, get their digests to check:
    - Discount percentages
    - Original vs current prices
+   - Best effective price after bank offers
    - Customer ratings
    - Available offers
 
@@ -62,8 +63,9 @@ Focus on products with high ratings (4+ stars) and good discounts (>20%). Presen
 ## Search Strategy:
 - Use search_products with query="{category}" and sort="price_low_to_high"
 - Also try search_products with query="{category}" and sort="popularity"
-- For top results, use get_product_details to get comprehensive information
-- Compare discount percentages and customer ratings
+- For top results, call get_product_digest once with all their product_link_argument values
+- Compare discount percentages, best effective prices and customer ratings
+- Only use get_product_details when full specifications are needed
 
 ## Evaluation Criteria:
 - Rating: 4.0+ stars preferred
@@ -179,13 +181,15 @@ Focus on products with significant seasonal discounts and time-limited offers.
 
 ## Search Strategy:
 - Search for "{category}" with different sort options
-- Look for products with high discount percentages
+- Call get_product_digest once with the product_link_argument values of the candidates
+  instead of fetching full product details for each
+- Look for products with high discount percentages and a low best_effective_price
 - Check for seasonal keywords in product descriptions
 - Identify F-Assured products for guaranteed quality
 
 ## Deal Analysis:
 - **Discount Depth**: Look for >30% seasonal discounts
-- **Offer Types**: Bank offers, exchange offers, EMI options
+- **Offer Types**: Bank offers, exchange offers, EMI options (see offer_type_counts and best_bank_offer)
 - **Seasonal Variants**: Special {season} editions or colors
 - **Bundle Deals**: Combo offers and package deals
 - **Flash Sales**: Time-limited promotional pricing
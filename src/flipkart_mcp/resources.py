@@ -3,11 +3,16 @@ Resource implementations for the Flipkart MCP Server.
 """
 
 import httpx
+from typing import List
 
 try:
-    from .config import BASE_URL, SORT_OPTIONS
+    from .config import SORT_OPTIONS, TRAFFIC_LOG, UPSTREAM_MODE
+    from .traffic import traffic_config_problem
+    from .upstreams import upstream_pool
 except ImportError:
-    from flipkart_mcp.config import BASE_URL, SORT_OPTIONS
+    from flipkart_mcp.config import SORT_OPTIONS, TRAFFIC_LOG, UPSTREAM_MODE
+    from flipkart_mcp.traffic import traffic_config_problem
+    from flipkart_mcp.upstreams import upstream_pool
 
 
 def get_search_help() -> str:
@@ -70,24 +75,46 @@ def get_product_help() -> str:
 - The link argument should contain "/p/" followed by the product ID
 - If the product is not found, check if the link argument is correct
 - Use the calculated_discount_percent field for accurate discount information
+- To compare deals across several products, use get_product_digest with a list of link arguments;
+  it returns the best effective price after bank offers, offer type counts and ratings only
 """
 
 
 async def get_api_status() -> str:
-    """Check the status of the Flipkart API server."""
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{BASE_URL}/")
-            if response.status_code == 200:
-                return f"✅ Flipkart API server is running at {BASE_URL}"
-            else:
-                return f"⚠️ Flipkart API server responded with status {response.status_code}"
-    except httpx.TimeoutException:
-        return f"⏱️ Flipkart API server connection timed out at {BASE_URL}"
-    except httpx.ConnectError:
-        return f"❌ Cannot connect to Flipkart API server at {BASE_URL}"
-    except Exception as e:
-        return f"❌ Flipkart API server error: {str(e)}"
+    """Check the status of every Flipkart API server replica."""
+    problem = traffic_config_problem()
+    if UPSTREAM_MODE == "replay":
+        if problem is not None:
+            return f"❌ {problem}: tool calls will fail until it is recorded"
+        return f"🔁 Replaying recorded Flipkart API traffic from {TRAFFIC_LOG}"
+    
+    lines: List[str] = []
+    if problem is not None:
+        lines.append(f"⚠️ {problem}")
+    for upstream, result in await upstream_pool.check_health():
+        base_url = upstream.base_url
+        if result == 200:
+            lines.append(f"✅ Flipkart API server is running at {base_url}")
+        elif isinstance(result, int):
+            lines.append(f"⚠️ Flipkart API server at {base_url} responded with status {result}")
+        elif isinstance(result, httpx.TimeoutException):
+            lines.append(f"⏱️ Flipkart API server connection timed out at {base_url}")
+        elif isinstance(result, httpx.ConnectError):
+            lines.append(f"❌ Cannot connect to Flipkart API server at {base_url}")
+        else:
+            lines.append(f"❌ Flipkart API server error at {base_url}: {str(result)}")
+        
+        stats = upstream.stats()
+        lines.append(
+            f"   requests: {stats['requests']}, failures: {stats['failures']}, "
+            f"outstanding: {stats['outstanding']}, ejections: {stats['ejections']}, "
+            f"latency: {stats['latency_ms'] if stats['latency_ms'] is not None else '-'} ms"
+        )
+    
+    if UPSTREAM_MODE == "record":
+        lines.append(f"⏺️ Recording Flipkart API traffic to {TRAFFIC_LOG}")
+    
+    return "\n".join(lines)
 
 
 def get_server_info() -> str:
@@ -96,7 +123,7 @@ def get_server_info() -> str:
 # Flipkart MCP Server Information
 
 ## Server Capabilities:
-- **Tools**: Search products, get product details, search by price range
+- **Tools**: Search products, get product details, search by price range, product digests
 - **Resources**: Help documentation, API status monitoring
 - **Prompts**: Guided shopping workflows
 
@@ -104,6 +131,7 @@ def get_server_info() -> str:
 1. **search_products**: Search Flipkart marketplace with advanced filtering
 2. **get_product_details**: Get comprehensive product information
 3. **search_by_price_range**: Convenient price-based search
+4. **get_product_digest**: Compact price/offer/rating digests for one or many products
 
 ## Available Resources:
 1. **search-help**: Comprehensive search guide
@@ -13,13 +13,17 @@ from mcp.server.fastmcp import FastMCP
 # Handle both relative and absolute imports
 try:
     from .config import SERVER_NAME, RESOURCE_URIS
-    from .tools import search_products, get_product_details, search_by_price_range
+    from .tracing import configure_tracing, traced_tool
+    from .traffic import check_traffic_config
+    from .tools import search_products, get_product_details, search_by_price_range, get_product_digest
     from .resources import get_search_help, get_product_help, get_api_status, get_server_info
     from .prompts import get_search_results, get_product_info, find_best_deals, compare_products, track_price_range, seasonal_deals, gift_recommendations
 except ImportError:
     # Fall back to absolute imports when running directly
     from flipkart_mcp.config import SERVER_NAME, RESOURCE_URIS
-    from flipkart_mcp.tools import search_products, get_product_details, search_by_price_range
+    from flipkart_mcp.tracing import configure_tracing, traced_tool
+    from flipkart_mcp.traffic import check_traffic_config
+    from flipkart_mcp.tools import search_products, get_product_details, search_by_price_range, get_product_digest
     from flipkart_mcp.resources import get_search_help, get_product_help, get_api_status, get_server_info
     from flipkart_mcp.prompts import get_search_results, get_product_info, find_best_deals, compare_products, track_price_range, seasonal_deals, gift_recommendations
 
@@ -33,6 +37,11 @@ def create_server(transport: str = "stdio", host: str = "localhost", port: int =
         port: Port to bind to (only used for streamable-http)
     """
     
+    # Install the tracer provider (no-op unless FLIPKART_MCP_TRACING is set)
+    configure_tracing()
+    # Warn about an unknown upstream mode or a missing replay log
+    check_traffic_config()
+    
     # Initialize the MCP server with conditional parameters
     if transport == "streamable-http":
         mcp = FastMCP(SERVER_NAME, host=host, port=port)
@@ -40,10 +49,11 @@ def create_server(transport: str = "stdio", host: str = "localhost", port: int =
         # For stdio transport, don't specify host/port
         mcp = FastMCP(SERVER_NAME)
     
-    # Register Tools (Model-Controlled)
-    mcp.tool()(search_products)
-    mcp.tool()(get_product_details)
-    mcp.tool()(search_by_price_range)
+    # Register Tools (Model-Controlled), each dispatch recorded as a span
+    mcp.tool()(traced_tool(search_products))
+    mcp.tool()(traced_tool(get_product_details))
+    mcp.tool()(traced_tool(search_by_price_range))
+    mcp.tool()(traced_tool(get_product_digest))
     
     # Register Resources (Application-Controlled)
     mcp.resource(RESOURCE_URIS["search_help"])(get_search_help)
@@ -2,14 +2,120 @@
 Tool implementations for the Flipkart MCP Server.
 """
 
+import asyncio
+import time
 import httpx
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 from urllib.parse import quote
 
 try:
-    from .config import BASE_URL, DEFAULT_TIMEOUT, ERROR_MESSAGES
+    from .config import DEFAULT_TIMEOUT, ERROR_MESSAGES, MAX_RETRIES, UPSTREAM_MODE, PRODUCT_CACHE_TTL, PRODUCT_CACHE_MAX_ENTRIES, DIGEST_MAX_CONCURRENCY
+    from .aggregates import update_digest, public_digest, rating_distribution
+    from .tracing import inject_headers, set_attributes, span
+    from .traffic import traffic_recorder, traffic_replayer
+    from .upstreams import is_replica_failure, upstream_pool
 except ImportError:
-    from flipkart_mcp.config import BASE_URL, DEFAULT_TIMEOUT, ERROR_MESSAGES
+    from flipkart_mcp.config import DEFAULT_TIMEOUT, ERROR_MESSAGES, MAX_RETRIES, UPSTREAM_MODE, PRODUCT_CACHE_TTL, PRODUCT_CACHE_MAX_ENTRIES, DIGEST_MAX_CONCURRENCY
+    from flipkart_mcp.aggregates import update_digest, public_digest, rating_distribution
+    from flipkart_mcp.tracing import inject_headers, set_attributes, span
+    from flipkart_mcp.traffic import traffic_recorder, traffic_replayer
+    from flipkart_mcp.upstreams import is_replica_failure, upstream_pool
+
+# Product digests keyed by cleaned product link, oldest first:
+# {"fetched_at": monotonic seconds, "digest": digest}
+_product_cache: Dict[str, Dict[str, Any]] = {}
+
+
+async def _send(
+    base_url: str, path: str, params: Optional[Dict[str, Union[str, int]]] = None, attempt: int = 0
+) -> httpx.Response:
+    """GET a path from a replica, appending the exchange to the traffic log in record mode."""
+    start = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
+            response = await client.get(f"{base_url}{path}", params=params, headers=inject_headers({}))
+    except httpx.RequestError as e:
+        if UPSTREAM_MODE == "record":
+            traffic_recorder.record(
+                path, params, time.perf_counter() - start, upstream=base_url, attempt=attempt, error=e
+            )
+        raise
+    
+    if UPSTREAM_MODE == "record":
+        traffic_recorder.record(
+            path, params, time.perf_counter() - start, upstream=base_url, attempt=attempt, response=response
+        )
+    return response
+
+
+async def _attempt(
+    path: str, params: Optional[Dict[str, Union[str, int]]], tried: List[str], attempt: int
+) -> httpx.Response:
+    """
+    Make one upstream attempt, recorded as its own span.
+    
+    In replay mode the response comes from the recorded traffic log. Otherwise a
+    replica not in ``tried`` is chosen by the upstream pool, which records the
+    outcome for health tracking, and its base URL is appended to ``tried``.
+    """
+    with span(
+        "upstream.request",
+        **{"http.method": "GET", "url.path": path, "upstream.mode": UPSTREAM_MODE, "upstream.attempt": attempt},
+    ) as current:
+        if UPSTREAM_MODE == "replay":
+            response = await traffic_replayer.respond(path, params)
+            set_attributes(current, **{"http.status_code": response.status_code})
+            response.raise_for_status()
+            return response
+        
+        async with upstream_pool.request(exclude=tried) as upstream:
+            tried.append(upstream.base_url)
+            set_attributes(
+                current, **{"http.url": f"{upstream.base_url}{path}", "upstream.base_url": upstream.base_url}
+            )
+            response = await _send(upstream.base_url, path, params, attempt)
+            set_attributes(
+                current,
+                **{
+                    "http.status_code": response.status_code,
+                    "http.response_content_length": len(response.content),
+                },
+            )
+            response.raise_for_status()
+        return response
+
+
+def _can_retry(path: str, params: Optional[Dict[str, Union[str, int]]], tried: List[str], attempt: int) -> bool:
+    """Whether a failed attempt can be retried on another replica."""
+    if UPSTREAM_MODE == "replay":
+        # Replay the retries that were recorded, no more and no fewer
+        return traffic_replayer.next_is_retry(path, params)
+    return attempt < MAX_RETRIES and len(tried) < len(upstream_pool.upstreams)
+
+
+async def _fetch_json(path: str, params: Optional[Dict[str, Union[str, int]]] = None) -> Any:
+    """
+    GET a path from the Flipkart API and decode the JSON body.
+    
+    These GETs are idempotent, so an attempt that fails because of the replica
+    (transport error, timeout or outage) is retried on a different replica, up
+    to MAX_RETRIES times. The trace context is propagated to the API server and
+    the decode step is recorded as a separate span. httpx errors from the last
+    attempt propagate to the caller.
+    """
+    tried: List[str] = []
+    attempt = 0
+    while True:
+        try:
+            response = await _attempt(path, params, tried, attempt)
+            break
+        except httpx.HTTPError as e:
+            if not (is_replica_failure(e) and _can_retry(path, params, tried, attempt)):
+                raise
+            attempt += 1
+    
+    with span("upstream.decode", **{"url.path": path}):
+        return response.json()
 
 
 async def search_products(
@@ -35,8 +141,8 @@ async def search_products(
     # URL encode the query
     encoded_query = quote(query)
     
-    # Build the URL
-    url = f"{BASE_URL}/search/{encoded_query}"
+    # Build the path
+    path = f"/search/{encoded_query}"
     
     # Build query parameters
     params: Dict[str, Union[str, int]] = {}
@@ -50,13 +156,10 @@ async def search_products(
         params["max_price"] = max_price
     
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Add helpful information about how to get product details
+        data = await _fetch_json(path, params=params)
+        
+        # Add helpful information about how to get product details
+        with span("search.enrich"):
             if "result" in data and isinstance(data["result"], list):
                 for product in data["result"]:
                     if "link" in product:
@@ -65,8 +168,8 @@ async def search_products(
                         if flipkart_url.startswith("https://flipkart.com/"):
                             product_link_arg = flipkart_url.replace("https://flipkart.com/", "")
                             product["product_link_argument"] = product_link_arg
-            
-            return data
+        
+        return data
             
     except httpx.TimeoutException:
         return {
@@ -94,6 +197,30 @@ async def search_products(
         }
 
 
+def _clean_product_link(product_link_argument: str) -> str:
+    """Clean the product link argument (remove any leading/trailing slashes or spaces)."""
+    clean_link = product_link_argument.strip().strip("/")
+    
+    if clean_link.startswith("0.0.0.0:3000"):
+        clean_link = clean_link.replace("0.0.0.0:3000", "")
+    
+    return clean_link
+
+
+def _cache_product(clean_link: str, product: Dict[str, Any]) -> None:
+    """Update the cached digest for a freshly fetched product from the previous entry."""
+    with span("product.digest", **{"flipkart.product_link": clean_link}):
+        previous = _product_cache.pop(clean_link, None)
+        digest = update_digest(product, previous["digest"] if previous else None)
+        _product_cache[clean_link] = {
+            "fetched_at": time.monotonic(),
+            "digest": digest,
+        }
+    
+    while len(_product_cache) > PRODUCT_CACHE_MAX_ENTRIES:
+        del _product_cache[next(iter(_product_cache))]
+
+
 async def get_product_details(product_link_argument: str) -> Dict[str, Any]:
     """
     Get detailed information about a specific product.
@@ -109,11 +236,7 @@ async def get_product_details(product_link_argument: str) -> Dict[str, Any]:
     Returns:
         Dict containing detailed product information including specs, pricing, reviews, etc.
     """
-    # Clean the product link argument (remove any leading/trailing slashes or spaces)
-    clean_link = product_link_argument.strip().strip("/")
-    
-    if clean_link.startswith("0.0.0.0:3000"):
-        clean_link = clean_link.replace("0.0.0.0:3000", "")
+    clean_link = _clean_product_link(product_link_argument)
 
     # Validate the link format
     if not clean_link or len(clean_link) < 10:
@@ -123,17 +246,14 @@ async def get_product_details(product_link_argument: str) -> Dict[str, Any]:
             "status": "failed"
         }
     
-    # Build the URL
-    url = f"{BASE_URL}/product/{clean_link}"
+    # Build the path
+    path = f"/product/{clean_link}"
     
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Add some helpful computed information
+        data = await _fetch_json(path)
+        
+        # Add some helpful computed information
+        with span("product.enrich"):
             if isinstance(data, dict):
                 data["flipkart_url"] = f"https://www.flipkart.com/{clean_link}"
                 
@@ -148,8 +268,10 @@ async def get_product_details(product_link_argument: str) -> Dict[str, Any]:
                     except (ValueError, TypeError):
                         # Skip discount calculation if prices can't be converted to numbers
                         pass
-            
-            return data
+                
+                _cache_product(clean_link, data)
+        
+        return data
             
     except httpx.TimeoutException:
         return {
@@ -203,4 +325,62 @@ async def search_by_price_range(
         page_number=page_number,
         min_price=min_price,
         max_price=max_price,
-    ) 
\ No newline at end of file
+    ) 
+
+
+async def get_product_digest(product_link_arguments: List[str]) -> Dict[str, Any]:
+    """
+    Get compact pricing, offer and rating digests for one or more products.
+    
+    Use this instead of get_product_details when comparing deals: each digest
+    carries the best effective price after the best applicable bank offer, offer
+    type counts, rating and top highlights, without specs or the raw offers list.
+    Digests are cached per product and refreshed whenever the product is
+    re-fetched. At most DIGEST_MAX_CONCURRENCY products are fetched at once.
+    
+    Args:
+        product_link_arguments: List of product link arguments, in the same format
+                                accepted by get_product_details
+        
+    Returns:
+        Dict containing the product digests, any per-product errors, and the
+        rating distribution across the returned products
+    """
+    fetch_limit = asyncio.Semaphore(DIGEST_MAX_CONCURRENCY)
+    
+    async def _digest(product_link_argument: str) -> Dict[str, Any]:
+        clean_link = _clean_product_link(product_link_argument)
+        entry = _product_cache.get(clean_link)
+        
+        if entry is None or time.monotonic() - entry["fetched_at"] > PRODUCT_CACHE_TTL:
+            async with fetch_limit:
+                product = await get_product_details(product_link_argument)
+            if product.get("status") == "failed":
+                return product
+            entry = _product_cache.get(clean_link)
+            if entry is None:
+                return {
+                    "error": ERROR_MESSAGES["json_error"],
+                    "product_link_argument": product_link_argument,
+                    "status": "failed"
+                }
+        
+        digest = public_digest(entry["digest"])
+        digest["product_link_argument"] = clean_link
+        return digest
+    
+    # Fetch each product once, however many spellings of its link were passed
+    unique_arguments: Dict[str, str] = {}
+    for arg in product_link_arguments:
+        unique_arguments.setdefault(_clean_product_link(arg), arg)
+    
+    results = await asyncio.gather(*(_digest(arg) for arg in unique_arguments.values()))
+    
+    digests = [result for result in results if result.get("status") != "failed"]
+    errors = [result for result in results if result.get("status") == "failed"]
+    
+    return {
+        "products": digests,
+        "errors": errors,
+        "rating_distribution": rating_distribution(digests),
+    }
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Tracing support for the Flipkart MCP Server.
+
+Spans are recorded through OpenTelemetry when the optional ``tracing`` extra is
+installed and an exporter is selected via ``FLIPKART_MCP_TRACING``. Otherwise
+every helper in this module is a no-op.
+"""
+
+import functools
+import sys
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+try:
+    from .config import TRACING_EXPORTER, TRACING_FILE, TRACING_SERVICE_NAME
+except ImportError:
+    from flipkart_mcp.config import TRACING_EXPORTER, TRACING_FILE, TRACING_SERVICE_NAME
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    propagate = None
+    trace = None
+
+T = TypeVar("T")
+
+_tracer: Optional[Any] = None
+_configured = False
+
+
+def _build_exporter(exporter: str) -> Optional[Any]:
+    """Create the span exporter selected by configuration."""
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if exporter == "console":
+        # stdout carries the MCP stdio transport, so spans go to stderr
+        return ConsoleSpanExporter(out=sys.stderr)
+    if exporter == "file":
+        return ConsoleSpanExporter(
+            out=open(TRACING_FILE, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    return None
+
+
+def configure_tracing(exporter: str = TRACING_EXPORTER) -> None:
+    """Install the tracer provider for the selected exporter (idempotent).
+
+    Args:
+        exporter: "none", "console", "file" or "otlp"
+    """
+    global _tracer, _configured
+
+    if _configured:
+        return
+    _configured = True
+
+    if exporter == "none":
+        return
+    if trace is None:
+        print(
+            f"Tracing exporter '{exporter}' requested but OpenTelemetry is not installed; "
+            "install the 'tracing' extra to enable it",
+            file=sys.stderr,
+        )
+        return
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+        span_exporter = _build_exporter(exporter)
+    except ImportError as e:
+        print(f"Tracing exporter '{exporter}' is unavailable: {str(e)}", file=sys.stderr)
+        return
+
+    if span_exporter is None:
+        print(f"Unknown tracing exporter '{exporter}', tracing disabled", file=sys.stderr)
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": TRACING_SERVICE_NAME}))
+    if exporter == "otlp":
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    else:
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("flipkart_mcp")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """Record a span around the enclosed block.
+
+    Attributes with a value of None are dropped. Yields the active span, or None
+    when tracing is disabled.
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    attrs = {key: value for key, value in attributes.items() if value is not None}
+    with _tracer.start_as_current_span(name, attributes=attrs) as current:
+        yield current
+
+
+def set_attributes(current: Optional[Any], **attributes: Any) -> None:
+    """Set attributes on a span yielded by ``span`` (no-op when tracing is disabled)."""
+    if current is None:
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+def mark_failed(current: Optional[Any], description: str) -> None:
+    """Mark a span as failed without an exception being raised through it."""
+    if current is None:
+        return
+    current.set_status(Status(StatusCode.ERROR, description))
+
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add W3C trace context headers for the active span to ``headers``."""
+    if _tracer is not None and propagate is not None:
+        propagate.inject(headers)
+    return headers
+
+
+def traced_tool(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Wrap an async tool so each dispatch is recorded as a span.
+
+    The wrapper keeps the tool's name, docstring and signature so FastMCP
+    registers it exactly like the undecorated function.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        with span(f"mcp.tool/{func.__name__}", **{"mcp.tool.name": func.__name__}) as current:
+            result = await func(*args, **kwargs)
+            if isinstance(result, dict) and result.get("status") == "failed":
+                mark_failed(current, str(result.get("error", "")))
+            return result
+
+    return wrapper
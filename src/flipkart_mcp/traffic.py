@@ -0,0 +1,198 @@
+"""
+Upstream traffic recording and replay for the Flipkart MCP Server.
+
+In record mode every upstream exchange is appended to ``TRAFFIC_LOG`` as one
+compact JSON line. In replay mode requests are answered from that log instead of
+the network, with the recorded latency scaled by ``REPLAY_SPEED``.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Optional, TextIO, Tuple, Union
+
+import httpx
+
+try:
+    from .config import REPLAY_SPEED, TRAFFIC_LOG, UPSTREAM_MODE
+except ImportError:
+    from flipkart_mcp.config import REPLAY_SPEED, TRAFFIC_LOG, UPSTREAM_MODE
+
+UPSTREAM_MODES = ("live", "record", "replay")
+
+Params = Optional[Mapping[str, Union[str, int]]]
+
+
+def traffic_config_problem() -> Optional[str]:
+    """Describe why the configured upstream mode cannot run as asked, or None if it can."""
+    if UPSTREAM_MODE not in UPSTREAM_MODES:
+        return (
+            f"Unknown upstream mode '{UPSTREAM_MODE}' (expected one of {', '.join(UPSTREAM_MODES)}); "
+            "running live without recording"
+        )
+    if UPSTREAM_MODE == "replay" and not os.path.isfile(TRAFFIC_LOG):
+        return f"Replay traffic log {TRAFFIC_LOG} not found"
+    if UPSTREAM_MODE == "record" and not _is_writable(TRAFFIC_LOG):
+        return f"Traffic log {TRAFFIC_LOG} is not writable; upstream traffic will not be recorded"
+    return None
+
+
+def _is_writable(log_path: str) -> bool:
+    if os.path.exists(log_path):
+        return os.path.isfile(log_path) and os.access(log_path, os.W_OK)
+    directory = os.path.dirname(os.path.abspath(log_path))
+    return os.path.isdir(directory) and os.access(directory, os.W_OK)
+
+
+def check_traffic_config() -> None:
+    """Warn on stderr about a misconfigured upstream mode (called at server start)."""
+    problem = traffic_config_problem()
+    if problem is not None:
+        print(problem, file=sys.stderr)
+
+
+def _params_key(params: Params) -> str:
+    """Canonical form of query parameters, so recorded and replayed requests match."""
+    return json.dumps({key: str(value) for key, value in (params or {}).items()}, sort_keys=True)
+
+
+class TrafficRecorder:
+    """Append-only JSON-lines log of upstream exchanges.
+
+    Failing to write the log never fails the request being recorded: the first
+    error is reported on stderr and later exchanges are still attempted.
+    """
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self._file: Optional[TextIO] = None
+        self._warned = False
+
+    def record(
+        self,
+        path: str,
+        params: Params,
+        elapsed: float,
+        upstream: Optional[str] = None,
+        attempt: int = 0,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Append one exchange: either the response received or the transport error raised.
+
+        ``attempt`` is 0 for a first request and counts up for retries on other replicas.
+        """
+        entry: Dict[str, Any] = {
+            "ts": round(time.time(), 3),
+            "method": "GET",
+            "path": path,
+            "params": json.loads(_params_key(params)),
+            "upstream": upstream,
+            "elapsed": round(elapsed, 4),
+        }
+        if attempt:
+            entry["attempt"] = attempt
+        if response is not None:
+            entry["status"] = response.status_code
+            entry["content_type"] = response.headers.get("content-type")
+            entry["body"] = response.text
+        if error is not None:
+            entry["error"] = type(error).__name__
+            entry["message"] = str(error)
+
+        try:
+            if self._file is None:
+                self._file = open(self.log_path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._file.flush()
+        except OSError as e:
+            if not self._warned:
+                print(
+                    f"Cannot write traffic log {self.log_path}: {str(e)}; "
+                    "exchanges are not recorded while this persists",
+                    file=sys.stderr,
+                )
+                self._warned = True
+
+
+class TrafficReplayer:
+    """Serves upstream requests from a recorded traffic log.
+
+    Repeated requests for the same path and parameters cycle through the
+    recorded exchanges in their original order.
+    """
+
+    def __init__(self, log_path: str, speed: float = 1.0):
+        self.log_path = log_path
+        self.speed = speed
+        self._exchanges: Optional[Dict[Tuple[str, str], List[Dict[str, Any]]]] = None
+        self._cursors: Dict[Tuple[str, str], int] = {}
+
+    def _load(self) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        if self._exchanges is None:
+            exchanges: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            with open(self.log_path, encoding="utf-8") as log:
+                for line in log:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = (entry["path"], _params_key(entry.get("params")))
+                    exchanges.setdefault(key, []).append(entry)
+            self._exchanges = exchanges
+        return self._exchanges
+
+    def next_is_retry(self, path: str, params: Params = None) -> bool:
+        """Whether the next recorded exchange for a request was a retry of a failed attempt."""
+        key = (path, _params_key(params))
+        entries = self._load().get(key)
+        if not entries:
+            return False
+        return bool(entries[self._cursors.get(key, 0) % len(entries)].get("attempt"))
+
+    async def respond(self, path: str, params: Params = None) -> httpx.Response:
+        """
+        Replay the next recorded exchange for a request.
+
+        Returns:
+            The recorded response
+
+        Raises:
+            httpx.RequestError: If the exchange was recorded as a transport error,
+                                no exchange was recorded for the request, or
+                                the log does not exist
+        """
+        key = (path, _params_key(params))
+        request = httpx.Request("GET", f"http://replay{path}", params=params)
+        try:
+            entries = self._load().get(key)
+        except FileNotFoundError:
+            raise httpx.RequestError(f"Replay traffic log {self.log_path} not found", request=request) from None
+        if not entries:
+            raise httpx.RequestError(f"No recorded response for GET {path}", request=request)
+
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        entry = entries[cursor % len(entries)]
+
+        if self.speed > 0:
+            await asyncio.sleep(entry["elapsed"] / self.speed)
+
+        if "error" in entry:
+            error_class = getattr(httpx, entry["error"], None)
+            if not (isinstance(error_class, type) and issubclass(error_class, httpx.RequestError)):
+                error_class = httpx.RequestError
+            raise error_class(entry.get("message", ""), request=request)
+
+        headers = {"content-type": entry["content_type"]} if entry.get("content_type") else {}
+        return httpx.Response(
+            entry["status"],
+            headers=headers,
+            content=entry.get("body", "").encode("utf-8"),
+            request=request,
+        )
+
+
+traffic_recorder = TrafficRecorder(TRAFFIC_LOG)
+traffic_replayer = TrafficReplayer(TRAFFIC_LOG, REPLAY_SPEED)
@@ -0,0 +1,214 @@
+"""
+Upstream replica selection for the Flipkart MCP Server.
+
+Requests are spread over the flipkart-scraper-api replicas listed in
+``BASE_URLS``. Replicas that fail repeatedly (connection errors, timeouts or
+5xx responses other than 502) are ejected and only reintroduced once an active
+health check against ``HEALTH_CHECK_PATH`` succeeds.
+
+The scraper answers 502 whenever a scrape or parse fails, which includes bad
+or nonexistent product links, so a 502 is treated as a problem with the request
+rather than with the replica.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+try:
+    from .config import (
+        BASE_URLS,
+        HEALTH_CHECK_INTERVAL,
+        HEALTH_CHECK_PATH,
+        HEALTH_CHECK_TIMEOUT,
+        UPSTREAM_BALANCING,
+        UPSTREAM_EJECT_AFTER_FAILURES,
+    )
+except ImportError:
+    from flipkart_mcp.config import (
+        BASE_URLS,
+        HEALTH_CHECK_INTERVAL,
+        HEALTH_CHECK_PATH,
+        HEALTH_CHECK_TIMEOUT,
+        UPSTREAM_BALANCING,
+        UPSTREAM_EJECT_AFTER_FAILURES,
+    )
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+BALANCING_STRATEGIES = ("least_outstanding", "latency")
+
+
+def is_replica_failure(error: Exception) -> bool:
+    """Whether a request error points at the replica rather than at the request.
+
+    Transport errors (connection failures, timeouts) and 5xx responses count,
+    except 502, which the scraper returns for any scrape or parse error,
+    including bad product links.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code >= 500 and status_code != 502
+    return False
+
+
+class Upstream:
+    """A single scraper replica and its request statistics."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.latency_ewma: Optional[float] = None
+        self.last_health_check: Optional[float] = None
+
+    def record_success(self, elapsed: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        if self.latency_ewma is None:
+            self.latency_ewma = elapsed
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.healthy and self.consecutive_failures >= UPSTREAM_EJECT_AFTER_FAILURES:
+            self.healthy = False
+            self.ejections += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections,
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+        }
+
+
+class UpstreamPool:
+    """Health-aware selection over a set of scraper replicas."""
+
+    def __init__(self, base_urls: List[str], balancing: str = "least_outstanding"):
+        if not base_urls:
+            raise ValueError("UpstreamPool needs at least one upstream base URL")
+        if balancing not in BALANCING_STRATEGIES:
+            print(
+                f"Unknown upstream balancing '{balancing}' (expected one of "
+                f"{', '.join(BALANCING_STRATEGIES)}); using least_outstanding",
+                file=sys.stderr,
+            )
+            balancing = "least_outstanding"
+
+        self.upstreams = [Upstream(base_url) for base_url in base_urls]
+        self.balancing = balancing
+        self._next = 0
+        self._health_task: Optional[asyncio.Task[None]] = None
+
+    def _score(self, upstream: Upstream) -> float:
+        if self.balancing == "latency":
+            # Replicas without samples yet are tried first
+            latency = upstream.latency_ewma if upstream.latency_ewma is not None else 0.0
+            return latency * (upstream.outstanding + 1)
+        return float(upstream.outstanding)
+
+    def select(self, exclude: Sequence[str] = ()) -> Upstream:
+        """Pick the replica for the next request.
+
+        Only healthy replicas not in ``exclude`` (base URLs already tried) are
+        considered. If none are left, ejected replicas not yet tried are used,
+        and failing that every replica, so requests still go out. Ties are
+        broken round-robin.
+        """
+        untried = [upstream for upstream in self.upstreams if upstream.base_url not in exclude]
+        candidates = [upstream for upstream in untried if upstream.healthy] or untried or self.upstreams
+        offset = self._next % len(candidates)
+        self._next += 1
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=self._score)
+
+    @asynccontextmanager
+    async def request(self, exclude: Sequence[str] = ()) -> AsyncIterator[Upstream]:
+        """Select a replica and record the outcome of the request made against it.
+
+        Errors for which ``is_replica_failure`` holds (raised in the block, e.g. via
+        ``raise_for_status``) count as replica failures; anything else counts as
+        a completed request.
+        """
+        self.ensure_health_checks()
+        upstream = self.select(exclude)
+        upstream.outstanding += 1
+        start = time.perf_counter()
+        try:
+            yield upstream
+        except httpx.HTTPError as e:
+            if is_replica_failure(e):
+                upstream.record_failure()
+            else:
+                upstream.record_success(time.perf_counter() - start)
+            raise
+        else:
+            upstream.record_success(time.perf_counter() - start)
+        finally:
+            upstream.outstanding -= 1
+
+    async def _probe(self, client: httpx.AsyncClient, upstream: Upstream) -> Union[int, Exception]:
+        try:
+            response = await client.get(f"{upstream.base_url}{HEALTH_CHECK_PATH}")
+        except Exception as e:
+            result: Union[int, Exception] = e
+        else:
+            result = response.status_code
+
+        upstream.last_health_check = time.time()
+        if result == 200:
+            upstream.healthy = True
+            upstream.consecutive_failures = 0
+        elif upstream.healthy:
+            upstream.healthy = False
+            upstream.ejections += 1
+        return result
+
+    async def check_health(self) -> List[Tuple[Upstream, Union[int, Exception]]]:
+        """Probe every replica's HEALTH_CHECK_PATH, ejecting or reintroducing it.
+
+        Returns:
+            List of (replica, status code or exception raised by the probe)
+        """
+        async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT) as client:
+            results = await asyncio.gather(*(self._probe(client, upstream) for upstream in self.upstreams))
+        return list(zip(self.upstreams, results, strict=True))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            await self.check_health()
+
+    def ensure_health_checks(self) -> None:
+        """Start periodic health checks on the running event loop (multi-replica only)."""
+        if len(self.upstreams) < 2 or HEALTH_CHECK_INTERVAL <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [upstream.stats() for upstream in self.upstreams]
+
+
+upstream_pool = UpstreamPool(BASE_URLS, UPSTREAM_BALANCING)
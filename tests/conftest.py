@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the Flipkart MCP Server tests.
+"""
+
+from typing import Callable, Dict, List
+
+import httpx
+import pytest
+
+from flipkart_mcp import tools, upstreams
+from flipkart_mcp.upstreams import UpstreamPool
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def mock_transport(monkeypatch: pytest.MonkeyPatch) -> Callable[[Handler], List[httpx.Request]]:
+    """Route every httpx.AsyncClient through a MockTransport calling ``handler``.
+
+    Returns a function that installs the handler and returns the list the
+    requests it receives are appended to.
+    """
+    real_client = httpx.AsyncClient
+
+    def install(handler: Handler) -> List[httpx.Request]:
+        requests: List[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return handler(request)
+
+        def client(*args: object, **kwargs: object) -> httpx.AsyncClient:
+            kwargs["transport"] = httpx.MockTransport(record)
+            return real_client(*args, **kwargs)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(httpx, "AsyncClient", client)
+        return requests
+
+    return install
+
+
+@pytest.fixture
+def replica_pool(monkeypatch: pytest.MonkeyPatch) -> Callable[..., UpstreamPool]:
+    """Give the tools a fresh UpstreamPool over the given base URLs, with no background health checks."""
+    monkeypatch.setattr(upstreams, "HEALTH_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(tools, "UPSTREAM_MODE", "live")
+
+    def make(*base_urls: str) -> UpstreamPool:
+        pool = UpstreamPool(list(base_urls))
+        monkeypatch.setattr(tools, "upstream_pool", pool)
+        return pool
+
+    return make
+
+
+@pytest.fixture
+def replica_handler() -> Callable[[Dict[str, object]], Handler]:
+    """Build handlers answering per host: a status code, a JSON body, or an exception class to raise."""
+
+    def build(behaviour: Dict[str, object]) -> Handler:
+        def handler(request: httpx.Request) -> httpx.Response:
+            outcome = behaviour[request.url.host]
+            if isinstance(outcome, type) and issubclass(outcome, Exception):
+                raise outcome("connection refused", request=request)
+            if isinstance(outcome, int):
+                return httpx.Response(outcome, json={"error": "upstream"})
+            return httpx.Response(200, json=outcome)
+
+        return handler
+
+    return build
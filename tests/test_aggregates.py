@@ -0,0 +1,166 @@
+"""
+Tests for bank offer parsing and product digests.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from flipkart_mcp import tools
+from flipkart_mcp.aggregates import bank_offer_discount, parse_bank_offer, update_digest
+
+SAMPLE_PRODUCT = Path(__file__).parent.parent / "flipkart-scraper-api" / "sample-product.json"
+
+
+def test_percent_offer_with_cap_and_min_order():
+    terms = parse_bank_offer("10% off on ICICI Bank Credit Card, up to ₹1000 on orders of ₹5,000 and above")
+
+    assert terms == {"percent": 10.0, "flat": None, "max_discount": 1000.0, "min_order": 5000.0}
+    assert bank_offer_discount(terms, 12999) == 1000.0
+    assert bank_offer_discount(terms, 4999) == 0.0
+
+
+def test_flat_offer_with_min_txn_value():
+    terms = parse_bank_offer(
+        "Flat ₹1,250 Off on HDFC Bank Credit Card EMI Txns on 6 months and above tenure, Min. Txn Value: ₹15,000"
+    )
+
+    assert terms == {"percent": None, "flat": 1250.0, "max_discount": None, "min_order": 15000.0}
+    assert bank_offer_discount(terms, 12999) == 0.0
+    assert bank_offer_discount(terms, 15999) == 1250.0
+
+
+def test_instant_discount_with_min_txn_value():
+    terms = parse_bank_offer("10% Instant Discount on SBI Credit Card Txns, up to ₹1,500. Min Txn Value: ₹7,499")
+
+    assert terms == {"percent": 10.0, "flat": None, "max_discount": 1500.0, "min_order": 7499.0}
+    assert bank_offer_discount(terms, 7000) == 0.0
+    assert bank_offer_discount(terms, 12999) == 1299.9
+    assert bank_offer_discount(terms, 20000) == 1500.0
+
+
+def test_upto_amount_is_a_cap_not_a_flat_discount():
+    terms = parse_bank_offer("Upto ₹3,000 off on ICICI Bank Credit Card Transactions")
+
+    assert terms == {"percent": None, "flat": None, "max_discount": 3000.0, "min_order": None}
+    assert bank_offer_discount(terms, 12999) == 0.0
+
+
+def test_percent_offer_with_qualifier_word():
+    terms = parse_bank_offer("5% Unlimited Cashback on Flipkart Axis Bank Credit Card")
+
+    assert terms == {"percent": 5.0, "flat": None, "max_discount": None, "min_order": None}
+    assert bank_offer_discount(terms, 12999) == 649.95
+
+
+def test_min_order_on_txns_above():
+    terms = parse_bank_offer("10% off on Kotak Bank Credit Card Txns above ₹500, up to ₹750")
+
+    assert terms == {"percent": 10.0, "flat": None, "max_discount": 750.0, "min_order": 500.0}
+    assert bank_offer_discount(terms, 499) == 0.0
+    assert bank_offer_discount(terms, 5000) == 500.0
+
+
+def test_offer_without_discount_terms():
+    assert parse_bank_offer("Get a free Spotify Premium subscription") is None
+
+
+@pytest.mark.parametrize(
+    ("price", "expected"),
+    [(12999, 1000.0), (5000, 500.0), (4999, 0.0)],
+)
+def test_sample_product_offers(price, expected):
+    product = json.loads(SAMPLE_PRODUCT.read_text(encoding="utf-8"))
+    bank_offers = [offer for offer in product["offers"] if offer["offer_type"] == "Bank Offer"]
+
+    discounts = [bank_offer_discount(parse_bank_offer(offer["description"]), price) for offer in bank_offers]
+
+    assert max(discounts) == expected
+
+
+def test_sample_product_digest():
+    product = json.loads(SAMPLE_PRODUCT.read_text(encoding="utf-8"))
+
+    pricing = update_digest(product)["pricing"]
+
+    assert pricing["best_effective_price"] == 11999.0
+    assert pricing["offer_type_counts"] == {"Bank Offer": 3, "Special Price": 1}
+
+
+async def test_product_digest_fetches_with_bounded_concurrency(replica_pool, mock_transport, monkeypatch):
+    monkeypatch.setattr(tools, "_product_cache", {})
+    monkeypatch.setattr(tools, "DIGEST_MAX_CONCURRENCY", 2)
+    replica_pool("http://a")
+    product = json.loads(SAMPLE_PRODUCT.read_text(encoding="utf-8"))
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=product)
+
+    requests = mock_transport(handler)
+
+    result = await tools.get_product_digest([f"product-{i}/p/itm{i:010d}" for i in range(6)])
+
+    assert len(result["products"]) == 6
+    assert len(requests) == 6
+    assert peak == 2
+
+
+def test_update_digest_reuses_unchanged_sections():
+    product = json.loads(SAMPLE_PRODUCT.read_text(encoding="utf-8"))
+    previous = update_digest(product)
+
+    refreshed = dict(product, current_price=11999)
+    digest = update_digest(refreshed, previous)
+
+    assert digest["rating"] is previous["rating"]
+    assert digest["top_highlights"] is previous["top_highlights"]
+    assert digest["pricing"] is not previous["pricing"]
+    assert digest["pricing"]["current_price"] == 11999
+    assert digest["_fingerprints"]["pricing"] != previous["_fingerprints"]["pricing"]
+
+
+def _sample_product_transport(mock_transport):
+    product = json.loads(SAMPLE_PRODUCT.read_text(encoding="utf-8"))
+    return mock_transport(lambda request: httpx.Response(200, json=product))
+
+
+async def test_product_digest_is_served_from_cache_within_ttl(replica_pool, mock_transport, monkeypatch):
+    monkeypatch.setattr(tools, "_product_cache", {})
+    replica_pool("http://a")
+    requests = _sample_product_transport(mock_transport)
+    link = "realme-11x/p/itm07be1a2ff1a1b"
+
+    first = await tools.get_product_digest([link])
+    second = await tools.get_product_digest([link])
+
+    assert len(requests) == 1
+    assert second == first
+
+    # Once the entry is older than the TTL the product is fetched again
+    tools._product_cache[link]["fetched_at"] -= tools.PRODUCT_CACHE_TTL + 1
+    await tools.get_product_digest([link])
+
+    assert len(requests) == 2
+
+
+async def test_product_digest_fetches_duplicate_links_once(replica_pool, mock_transport, monkeypatch):
+    monkeypatch.setattr(tools, "_product_cache", {})
+    replica_pool("http://a")
+    requests = _sample_product_transport(mock_transport)
+    link = "realme-11x/p/itm07be1a2ff1a1b"
+
+    result = await tools.get_product_digest([link, link + "/", f" {link} "])
+
+    assert len(requests) == 1
+    assert len(result["products"]) == 1
+    assert result["rating_distribution"]["4.0-4.5"] == 1
@@ -0,0 +1,64 @@
+"""
+Tests for tool dispatch and upstream tracing.
+"""
+
+import httpx
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+FastMCP = pytest.importorskip("mcp.server.fastmcp").FastMCP
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from flipkart_mcp import tools, tracing  # noqa: E402
+from flipkart_mcp.server import create_server  # noqa: E402
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    """Record spans in memory for the duration of a test."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("tests"))
+    return exporter
+
+
+async def test_traced_tools_keep_their_schema(spans):
+    plain = FastMCP("plain")
+    for tool in (tools.search_products, tools.get_product_details, tools.search_by_price_range, tools.get_product_digest):
+        plain.tool()(tool)
+
+    expected = {tool.name: (tool.description, tool.inputSchema) for tool in await plain.list_tools()}
+    traced = {tool.name: (tool.description, tool.inputSchema) for tool in await create_server().list_tools()}
+
+    assert traced == expected
+
+
+async def test_upstream_spans_nest_under_tool_span(spans, replica_pool, mock_transport):
+    replica_pool("http://a")
+    requests = mock_transport(lambda request: httpx.Response(200, json={"result": []}))
+
+    await create_server().call_tool("search_products", {"query": "phone"})
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    tool_span = finished["mcp.tool/search_products"]
+    for name in ("upstream.request", "upstream.decode", "search.enrich"):
+        assert finished[name].parent.span_id == tool_span.context.span_id
+        assert finished[name].context.trace_id == tool_span.context.trace_id
+
+    traceparent = requests[0].headers["traceparent"]
+    assert traceparent.split("-")[1] == format(tool_span.context.trace_id, "032x")
+    assert traceparent.split("-")[2] == format(finished["upstream.request"].context.span_id, "016x")
+
+
+async def test_failed_tool_call_marks_span_as_error(spans, replica_pool, mock_transport):
+    replica_pool("http://a")
+    mock_transport(lambda request: httpx.Response(502, json={"error": "scrape failed"}))
+
+    await create_server().call_tool("get_product_details", {"product_link_argument": "bad-link/p/itm0000000"})
+
+    tool_span = next(span for span in spans.get_finished_spans() if span.name == "mcp.tool/get_product_details")
+    assert not tool_span.status.is_ok
@@ -0,0 +1,107 @@
+"""
+Tests for upstream traffic recording and replay.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from flipkart_mcp import tools, traffic
+from flipkart_mcp.traffic import TrafficRecorder, TrafficReplayer
+
+
+@pytest.fixture
+def record_to(monkeypatch):
+    """Put the tools in record mode, logging to the given path."""
+
+    def install(log_path):
+        recorder = TrafficRecorder(str(log_path))
+        monkeypatch.setattr(tools, "UPSTREAM_MODE", "record")
+        monkeypatch.setattr(tools, "traffic_recorder", recorder)
+        return recorder
+
+    return install
+
+
+async def test_unwritable_log_does_not_fail_requests(
+    tmp_path, record_to, replica_pool, mock_transport, replica_handler, capsys
+):
+    replica_pool("http://a")
+    mock_transport(replica_handler({"a": {"result": []}}))
+    record_to(tmp_path / "missing-dir" / "traffic.jsonl")
+
+    assert await tools._fetch_json("/search/phone") == {"result": []}
+    assert await tools._fetch_json("/search/phone") == {"result": []}
+
+    warnings = capsys.readouterr().err
+    assert warnings.count("Cannot write traffic log") == 1
+
+
+def test_record_mode_reports_unwritable_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(traffic, "UPSTREAM_MODE", "record")
+    monkeypatch.setattr(traffic, "TRAFFIC_LOG", str(tmp_path / "missing-dir" / "traffic.jsonl"))
+    assert "not writable" in traffic.traffic_config_problem()
+
+    monkeypatch.setattr(traffic, "TRAFFIC_LOG", str(tmp_path / "traffic.jsonl"))
+    assert traffic.traffic_config_problem() is None
+
+
+async def _outcome(path):
+    try:
+        return ("ok", await tools._fetch_json(path))
+    except httpx.HTTPStatusError as e:
+        return ("status", e.response.status_code)
+    except httpx.RequestError as e:
+        return ("error", type(e).__name__)
+
+
+def _no_network(request):
+    raise AssertionError(f"unexpected network request in replay mode: {request.url}")
+
+
+async def test_record_then_replay_round_trip(
+    tmp_path, record_to, replica_pool, mock_transport, monkeypatch
+):
+    log_path = tmp_path / "traffic.jsonl"
+    paths = ["/search/phone", "/search/phone", "/product/gone/p/itm0000000", "/search/down"]
+    served = 0
+
+    def handler(request):
+        nonlocal served
+        # Replica "a" refuses every connection; "b" answers unless the path is down
+        if request.url.host == "a" or request.url.path == "/search/down":
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path.startswith("/product/"):
+            return httpx.Response(502, json={"error": "scrape failed"})
+        served += 1
+        return httpx.Response(200, json={"served": served})
+
+    replica_pool("http://a", "http://b")
+    mock_transport(handler)
+    record_to(log_path)
+    recorded = [await _outcome(path) for path in paths]
+
+    assert recorded[0] == ("ok", {"served": 1})
+    assert recorded[2] == ("status", 502)
+    assert recorded[3] == ("error", "ConnectError")
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert any(entry.get("attempt") == 1 for entry in entries)
+
+    monkeypatch.setattr(tools, "UPSTREAM_MODE", "replay")
+    monkeypatch.setattr(tools, "traffic_replayer", TrafficReplayer(str(log_path), speed=0))
+    mock_transport(_no_network)
+    replayed = [await _outcome(path) for path in paths]
+
+    assert replayed == recorded
+
+
+async def test_unrecorded_request_fails_in_replay(tmp_path, mock_transport, monkeypatch):
+    log_path = tmp_path / "traffic.jsonl"
+    log_path.write_text("", encoding="utf-8")
+    monkeypatch.setattr(tools, "UPSTREAM_MODE", "replay")
+    monkeypatch.setattr(tools, "traffic_replayer", TrafficReplayer(str(log_path), speed=0))
+    mock_transport(_no_network)
+
+    with pytest.raises(httpx.RequestError, match="No recorded response"):
+        await tools._fetch_json("/search/phone")
@@ -0,0 +1,92 @@
+"""
+Tests for replica selection, ejection and failover.
+"""
+
+import httpx
+import pytest
+
+from flipkart_mcp import tools
+from flipkart_mcp.upstreams import UPSTREAM_EJECT_AFTER_FAILURES
+
+
+async def test_replica_is_ejected_after_consecutive_failures(replica_pool, mock_transport, replica_handler):
+    pool = replica_pool("http://a")
+    mock_transport(replica_handler({"a": 500}))
+
+    for _ in range(UPSTREAM_EJECT_AFTER_FAILURES - 1):
+        with pytest.raises(httpx.HTTPStatusError):
+            await tools._fetch_json("/search/phone")
+    assert pool.upstreams[0].healthy
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await tools._fetch_json("/search/phone")
+    assert not pool.upstreams[0].healthy
+    assert pool.upstreams[0].stats()["ejections"] == 1
+
+
+async def test_bad_gateway_is_not_a_replica_failure(replica_pool, mock_transport, replica_handler):
+    pool = replica_pool("http://a", "http://b")
+    requests = mock_transport(replica_handler({"a": 502, "b": 502}))
+
+    for _ in range(UPSTREAM_EJECT_AFTER_FAILURES + 1):
+        with pytest.raises(httpx.HTTPStatusError):
+            await tools._fetch_json("/product/bad-link/p/itm0")
+
+    # Each 502 is returned as-is: no retry, no failures, nobody ejected
+    assert len(requests) == UPSTREAM_EJECT_AFTER_FAILURES + 1
+    for upstream in pool.upstreams:
+        assert upstream.healthy
+        assert upstream.failures == 0
+
+
+async def test_failed_request_is_retried_on_an_untried_replica(replica_pool, mock_transport, replica_handler):
+    pool = replica_pool("http://a", "http://b")
+    requests = mock_transport(replica_handler({"a": httpx.ConnectError, "b": {"result": []}}))
+
+    assert await tools._fetch_json("/search/phone") == {"result": []}
+
+    assert [request.url.host for request in requests] == ["a", "b"]
+    assert pool.upstreams[0].failures == 1
+    assert pool.upstreams[1].failures == 0
+
+
+async def test_retries_stop_at_max_retries(replica_pool, mock_transport, monkeypatch, replica_handler):
+    monkeypatch.setattr(tools, "MAX_RETRIES", 1)
+    replica_pool("http://a", "http://b", "http://c")
+    requests = mock_transport(replica_handler({"a": 500, "b": 500, "c": 500}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await tools._fetch_json("/search/phone")
+
+    hosts = [request.url.host for request in requests]
+    assert len(hosts) == 2
+    assert len(set(hosts)) == 2
+
+
+async def test_retries_stop_when_every_replica_was_tried(replica_pool, mock_transport, monkeypatch, replica_handler):
+    monkeypatch.setattr(tools, "MAX_RETRIES", 5)
+    replica_pool("http://a", "http://b")
+    requests = mock_transport(replica_handler({"a": httpx.ConnectError, "b": httpx.ConnectError}))
+
+    with pytest.raises(httpx.ConnectError):
+        await tools._fetch_json("/search/phone")
+
+    assert sorted(request.url.host for request in requests) == ["a", "b"]
+
+
+async def test_health_check_reintroduces_an_ejected_replica(replica_pool, mock_transport, replica_handler):
+    pool = replica_pool("http://a", "http://b")
+    upstream = pool.upstreams[0]
+    for _ in range(UPSTREAM_EJECT_AFTER_FAILURES):
+        upstream.record_failure()
+    assert not upstream.healthy
+    assert pool.select() is pool.upstreams[1]
+
+    mock_transport(replica_handler({"a": {"status": "ok"}, "b": httpx.ConnectError}))
+    results = {checked.base_url: result for checked, result in await pool.check_health()}
+
+    assert results["http://a"] == 200
+    assert upstream.healthy
+    assert upstream.consecutive_failures == 0
+    assert isinstance(results["http://b"], httpx.ConnectError)
+    assert not pool.upstreams[1].healthy